@@ -0,0 +1,87 @@
+import re
+import unicodedata
+from typing import Iterable
+
+
+# Characters a UTF-8 continuation byte (0x80-0xBF) turns into when mis-decoded as latin-1 or cp1252.
+_CONTINUATION_CHARS = "".join(
+    {bytes([b]).decode("latin-1") for b in range(0x80, 0xC0)}
+    | {bytes([b]).decode("cp1252", errors="ignore") for b in range(0x80, 0xC0)}
+)
+_MOJIBAKE_RE = re.compile(f"[\u00c2-\u00f4][{re.escape(_CONTINUATION_CHARS)}]{{1,3}}")
+
+_BOILERPLATE_RES = [
+    # Federalreserve.gov video player instructions preceding speeches that embed a video.
+    re.compile(r"Accessible Keys for Video.*?caption on/off\.", flags=re.DOTALL),
+]
+
+_NOISE_PARAGRAPH_RES = [
+    # match "*Small business" with optional space after *, case-insensitive
+    re.compile(r"^\*\s*small business$", flags=re.IGNORECASE),
+]
+
+_INLINE_WS_RE = re.compile(r"[ \t\u00a0\u2000-\u200b\u202f\u205f\u3000]+")
+
+
+def _repair_match(match: re.Match) -> str:
+    chunk = match.group()
+    for encoding in ("latin-1", "cp1252"):
+        try:
+            return chunk.encode(encoding).decode("utf-8")
+        except (UnicodeEncodeError, UnicodeDecodeError):
+            continue
+    return chunk
+
+
+def fix_mojibake(text: str) -> str:
+    """
+    Repair UTF-8 text that was decoded as latin-1/cp1252 (e.g. "conferenceâ€”the" -> "conference—the").
+    Sequences that don't decode as valid UTF-8 are left untouched.
+
+    Only for text known to be mis-decoded (records stored before ingest used the page charset):
+    on correctly decoded text it can damage valid sequences such as "É”".
+    """
+    return _MOJIBAKE_RE.sub(_repair_match, text)
+
+
+def strip_boilerplate(text: str) -> str:
+    """
+    Remove known page boilerplate (video player instructions etc.) from scraped text.
+    """
+    for pattern in _BOILERPLATE_RES:
+        text = pattern.sub("", text)
+    return text
+
+
+def normalize_whitespace(text: str) -> str:
+    """
+    Collapse runs of inline whitespace, strip each line and drop blank lines.
+    """
+    lines = (_INLINE_WS_RE.sub(" ", line).strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def clean_text(text: str) -> str:
+    """
+    Full cleaning stage applied to scraped text before it is stored or sent to the LLM.
+    Expects correctly decoded input; see fix_mojibake for legacy records.
+    """
+    text = unicodedata.normalize("NFC", text)
+    text = strip_boilerplate(text)
+    return normalize_whitespace(text)
+
+
+def is_noise_paragraph(text: str) -> bool:
+    """
+    True for paragraphs that carry no content of their own (e.g. DOD "*Small business" footnotes).
+    """
+    text = text.strip()
+    return any(pattern.match(text) for pattern in _NOISE_PARAGRAPH_RES)
+
+
+def clean_paragraphs(paragraphs: Iterable[str]) -> list[str]:
+    """
+    Clean each paragraph and drop the ones that end up empty or are noise.
+    """
+    cleaned = (clean_text(p) for p in paragraphs)
+    return [p for p in cleaned if p and not is_noise_paragraph(p)]
@@ -1,54 +1,156 @@
 import os
-from openai import OpenAI
+import time
+import threading
+from functools import lru_cache
+import httpx
+from openai import (
+    OpenAI,
+    DefaultHttpxClient,
+    APIConnectionError,
+    APITimeoutError,
+    RateLimitError,
+    InternalServerError,
+)
 from dotenv import load_dotenv
 from pydantic import BaseModel
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 load_dotenv()
 
+# Default system prompt for structured extraction; also used for the extraction fine-tuning data.
+EXTRACTION_PROMPT = "Extract structured information from the content."
+# Errors that suggest the API itself is unavailable; only these count towards the circuit breaker.
+TRANSIENT_ERRORS = (APIConnectionError, APITimeoutError, RateLimitError, InternalServerError)
+
+
+class XAIRequestError(Exception):
+    """
+    Raised when a request to the Grok API fails or returns no usable output.
+    """
+
+
+class CircuitOpenError(XAIRequestError):
+    """
+    Raised without contacting the API while the client's circuit breaker is open.
+    """
+
 
 @dataclass
 class XAIClient:
     api_key: str = os.getenv("XAI_API_KEY")
     base_url: str = "https://api.x.ai/v1"
+    timeout: float = 120.0
+    connect_timeout: float = 10.0
+    max_retries: int = 2
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 60.0
+    failure_threshold: int = 5
+    reset_timeout: float = 60.0
+    _consecutive_failures: int = field(default=0, init=False, repr=False)
+    _opened_at: float | None = field(default=None, init=False, repr=False)
+    _half_open: bool = field(default=False, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
 
     def __post_init__(self):
+        # One pooled, keep-alive HTTP client per XAIClient; share the instance via get_xai_client().
+        http_client = DefaultHttpxClient(
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+        )
         self.client = OpenAI(
             api_key=self.api_key,
             base_url=self.base_url,
-            timeout=3600,
+            max_retries=self.max_retries,
+            http_client=http_client,
         )
-    
-    def get_response(self, model: str, messages: list = None):
+
+    def close(self):
+        """
+        Close the underlying HTTP connection pool.
+        """
+        self.client.close()
+
+    def _before_request(self):
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if self._half_open:
+                raise CircuitOpenError("Circuit half-open; waiting on the probe request")
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                raise CircuitOpenError(
+                    f"Circuit open after {self._consecutive_failures} consecutive failures; "
+                    f"retrying in {self.reset_timeout - (time.monotonic() - self._opened_at):.0f}s"
+                )
+            # Half-open: let this request through as the single probe; everyone else keeps failing fast.
+            self._half_open = True
+
+    def _record_success(self):
+        with self._lock:
+            self._consecutive_failures = 0
+            self._opened_at = None
+            self._half_open = False
+
+    def _record_failure(self):
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._half_open or self._consecutive_failures >= self.failure_threshold:
+                # A failed probe re-opens the circuit for another reset_timeout.
+                self._opened_at = time.monotonic()
+                self._half_open = False
+
+    def get_response(self, model: str, messages: list = None) -> str:
         """
         Get a response from the Grok AI model.
 
         :param model: The Grok model to use (e.g., 'grok-3').
         :param messages: The input messages for the AI model.
         :return: The response content from the AI model.
+        :raises XAIRequestError: If the request fails or the circuit breaker is open.
         """
+        self._before_request()
         try:
             completion = self.client.chat.completions.create(
                 model=model,
                 messages=messages
             )
-            return completion.choices[0].message.content
-
+            content = completion.choices[0].message.content
+        except TRANSIENT_ERRORS as e:
+            self._record_failure()
+            raise XAIRequestError(f"Grok request failed: {e}") from e
         except Exception as e:
-            print(f"Error: {e}")
-    
-    def get_structured_response(self, model: str, response_format: BaseModel = None, content: str = None):
+            # Bad request, length limit or parse error on this input: the API is up, so don't trip the breaker.
+            self._record_success()
+            raise XAIRequestError(f"Grok request failed: {e}") from e
+
+        self._record_success()
+        return content
+
+    def get_structured_response(
+        self,
+        model: str,
+        response_format: BaseModel = None,
+        content: str = None,
+        system_prompt: str = EXTRACTION_PROMPT,
+    ) -> BaseModel:
         """
         Get a structured output response from the Grok AI api.
 
         :param model: The Grok model to use (e.g., 'grok-3').
-        :param messages: The input messages for the AI model.
         :param response_format: The Pydantic model to define the structure of the response.
+        :param content: The text to extract structured information from.
+        :param system_prompt: Instruction sent as the system message.
+        :return: An instance of response_format.
+        :raises XAIRequestError: If the request fails, nothing is parsed, or the circuit breaker is open.
         """
         messages = [
             {
                 "role": "system",
-                "content": "Extract structured information from the content."
+                "content": system_prompt
             },
             {
                 "role": "user",
@@ -56,13 +158,34 @@ class XAIClient:
             }
         ]
 
+        self._before_request()
         try:
             completion = self.client.chat.completions.parse(
                 model=model,
                 messages=messages,
                 response_format=response_format,
             )
-            return completion.choices[0].message.parsed
-        
+            parsed = completion.choices[0].message.parsed
+        except TRANSIENT_ERRORS as e:
+            self._record_failure()
+            raise XAIRequestError(f"Grok request failed: {e}") from e
         except Exception as e:
-            print(f"Error: {e}")
+            # Bad request, length limit or parse error on this input: the API is up, so don't trip the breaker.
+            self._record_success()
+            raise XAIRequestError(f"Grok request failed: {e}") from e
+
+        if parsed is None:
+            # The API answered, so the connection is healthy; don't count this towards the breaker.
+            self._record_success()
+            raise XAIRequestError("Grok returned no parsed output")
+
+        self._record_success()
+        return parsed
+
+
+@lru_cache(maxsize=1)
+def get_xai_client() -> XAIClient:
+    """
+    Return the process-wide XAIClient so every caller reuses one connection pool.
+    """
+    return XAIClient()
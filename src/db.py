@@ -0,0 +1,382 @@
+import hashlib
+import json
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, is_dataclass
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+
+# Each migration is a list of statements so it can run, together with its user_version bump,
+# inside one transaction (executescript would commit on its own part-way through).
+SCHEMA_V1 = [
+    """
+    CREATE TABLE IF NOT EXISTS debt_entries (
+        date TEXT PRIMARY KEY,              -- as published, MM/DD/YYYY
+        iso_date TEXT NOT NULL,
+        public_debt REAL NOT NULL,
+        intragovernmental REAL NOT NULL,
+        total_debt REAL NOT NULL,
+        pub_date TEXT
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_debt_iso_date
+        ON debt_entries (iso_date, public_debt, intragovernmental, total_debt)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS speeches (
+        id INTEGER PRIMARY KEY,
+        url TEXT NOT NULL UNIQUE,
+        speaker TEXT NOT NULL,
+        title TEXT,
+        date TEXT,
+        location TEXT,
+        content TEXT,
+        summary TEXT,                       -- SpeechSummary JSON
+        summary_hash TEXT
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_speeches_speaker_date
+        ON speeches (speaker, date, title, url)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS awards (
+        id INTEGER PRIMARY KEY,
+        text_hash TEXT NOT NULL UNIQUE,     -- sha256 of award_text
+        contract_date TEXT,
+        contractor_name TEXT,               -- first contractor, for lookups
+        amount REAL,
+        purpose TEXT,
+        agency_name TEXT,
+        agency_location TEXT,
+        contractors TEXT,                   -- list[Entity] JSON
+        award_text TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_awards_date_amount
+        ON awards (contract_date, amount, contractor_name)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_awards_contractor_date
+        ON awards (contractor_name COLLATE NOCASE, contract_date, amount)
+    """,
+]
+
+# Make the date-range indexes cover every column get_debt_entries and get_awards select.
+SCHEMA_V2 = [
+    "DROP INDEX IF EXISTS idx_debt_iso_date",
+    """
+    CREATE INDEX IF NOT EXISTS idx_debt_iso_date
+        ON debt_entries (iso_date, date, public_debt, intragovernmental, total_debt)
+    """,
+    "DROP INDEX IF EXISTS idx_awards_date_amount",
+    """
+    CREATE INDEX IF NOT EXISTS idx_awards_date_amount
+        ON awards (contract_date, amount, contractor_name, purpose, agency_name)
+    """,
+]
+
+# Monotonic sequence stamped whenever a speech gets a new summary, so exporters can resume from it.
+SCHEMA_V3 = [
+    "ALTER TABLE speeches ADD COLUMN summary_seq INTEGER",
+    "UPDATE speeches SET summary_seq = id WHERE summary IS NOT NULL",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_speeches_summary_seq ON speeches (summary_seq)",
+]
+
+# (version, statements) pairs applied in order to databases below that version.
+MIGRATIONS = [
+    (1, SCHEMA_V1),
+    (2, SCHEMA_V2),
+    (3, SCHEMA_V3),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def _batched(rows: Iterable[tuple], size: int) -> Iterator[list[tuple]]:
+    it = iter(rows)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def _debt_row(entry: Any) -> tuple:
+    if is_dataclass(entry):
+        entry = asdict(entry)
+    iso_date = datetime.strptime(entry["date"], "%m/%d/%Y").date().isoformat()
+    return (
+        entry["date"],
+        iso_date,
+        entry["public_debt"],
+        entry["intragovernmental"],
+        entry["total_debt"],
+        entry.get("pub_date"),
+    )
+
+
+def _speech_row(speech: dict) -> tuple:
+    summary = speech.get("summary")
+    return (
+        speech["url"],
+        speech["speaker"],
+        speech.get("title"),
+        speech.get("date"),
+        speech.get("location"),
+        speech.get("content"),
+        json.dumps(summary, ensure_ascii=False) if summary is not None else None,
+        speech.get("summary_hash"),
+    )
+
+
+def _award_row(award: dict) -> tuple:
+    text = award["award_text"]
+    contractors = award.get("contractors") or []
+    agency = award.get("contracting_agency") or {}
+    return (
+        hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        award.get("contract_date"),
+        contractors[0].get("name", "").strip() if contractors else None,
+        award.get("amount"),
+        award.get("purpose"),
+        agency.get("name"),
+        agency.get("location"),
+        json.dumps(contractors, ensure_ascii=False),
+        text,
+    )
+
+
+@dataclass
+class Store:
+    """
+    Embedded SQLite store for debt entries, speeches and DOD awards.
+    WAL mode lets pollers in other processes write while readers query.
+    """
+    path: str = "../fedrss.db"
+    batch_size: int = 500
+    busy_timeout_ms: int = 5000
+
+    def __post_init__(self):
+        with self.connect() as conn:
+            self._migrate(conn)
+
+    @contextmanager
+    def connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        Open a connection, commit on success and roll back on error.
+        """
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _migrate(self, conn: sqlite3.Connection):
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return
+        # Take the write lock before re-reading the version, so concurrent openers migrate one at a time
+        # and a crash part-way through rolls back the whole thing, version bump included.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            current = conn.execute("PRAGMA user_version").fetchone()[0]
+            for version, statements in MIGRATIONS:
+                if current < version:
+                    for statement in statements:
+                        conn.execute(statement)
+                    conn.execute(f"PRAGMA user_version={version}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    def _executemany(self, sql: str, rows: Iterable[tuple]) -> int:
+        count = 0
+        with self.connect() as conn:
+            for batch in _batched(rows, self.batch_size):
+                conn.executemany(sql, batch)
+                count += len(batch)
+        return count
+
+    def upsert_debt_entries(self, entries: Iterable[Any]) -> int:
+        """
+        Insert or update debt entries (DebtEntry or dict), keyed by date.
+        """
+        return self._executemany(
+            """
+            INSERT INTO debt_entries (date, iso_date, public_debt, intragovernmental, total_debt, pub_date)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (date) DO UPDATE SET
+                iso_date = excluded.iso_date,
+                public_debt = excluded.public_debt,
+                intragovernmental = excluded.intragovernmental,
+                total_debt = excluded.total_debt,
+                pub_date = excluded.pub_date
+            """,
+            (_debt_row(e) for e in entries),
+        )
+
+    def upsert_speeches(self, speeches: Iterable[dict]) -> int:
+        """
+        Insert or update speech dicts, keyed by URL. An existing summary is kept if the new record has none.
+        A new or changed summary (by summary_hash) gets the next summary_seq.
+        """
+        return self._executemany(
+            """
+            INSERT INTO speeches (url, speaker, title, date, location, content, summary, summary_hash, summary_seq)
+            VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8,
+                    CASE WHEN ?8 IS NOT NULL THEN (SELECT COALESCE(MAX(summary_seq), 0) + 1 FROM speeches) END)
+            ON CONFLICT (url) DO UPDATE SET
+                summary_seq = CASE
+                    WHEN excluded.summary_hash IS NOT NULL AND excluded.summary_hash IS NOT speeches.summary_hash
+                    THEN (SELECT COALESCE(MAX(summary_seq), 0) + 1 FROM speeches)
+                    ELSE speeches.summary_seq
+                END,
+                speaker = excluded.speaker,
+                title = excluded.title,
+                date = excluded.date,
+                location = excluded.location,
+                content = excluded.content,
+                summary = COALESCE(excluded.summary, speeches.summary),
+                summary_hash = COALESCE(excluded.summary_hash, speeches.summary_hash)
+            """,
+            (_speech_row(s) for s in speeches),
+        )
+
+    def upsert_awards(self, awards: Iterable[dict]) -> int:
+        """
+        Insert or update extracted DodContractInfo records (with award_text and contract_date), keyed by award text.
+        """
+        return self._executemany(
+            """
+            INSERT INTO awards (text_hash, contract_date, contractor_name, amount, purpose,
+                                agency_name, agency_location, contractors, award_text)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (text_hash) DO UPDATE SET
+                contract_date = excluded.contract_date,
+                contractor_name = excluded.contractor_name,
+                amount = excluded.amount,
+                purpose = excluded.purpose,
+                agency_name = excluded.agency_name,
+                agency_location = excluded.agency_location,
+                contractors = excluded.contractors
+            """,
+            (_award_row(a) for a in awards),
+        )
+
+    def get_debt_entries(self, start_date: str, end_date: str) -> list[sqlite3.Row]:
+        """
+        Debt entries between two ISO dates (inclusive), oldest first.
+        """
+        with self.connect() as conn:
+            return conn.execute(
+                """
+                SELECT date, iso_date, public_debt, intragovernmental, total_debt
+                FROM debt_entries WHERE iso_date BETWEEN ? AND ? ORDER BY iso_date
+                """,
+                (start_date, end_date),
+            ).fetchall()
+
+    def get_speeches(self, speaker: str) -> list[sqlite3.Row]:
+        """
+        Title, date and URL of a speaker's speeches, newest first.
+        """
+        with self.connect() as conn:
+            return conn.execute(
+                "SELECT title, date, url FROM speeches WHERE speaker = ? ORDER BY date DESC",
+                (speaker,),
+            ).fetchall()
+
+    def get_awards(self, start_date: str, end_date: str, min_amount: float = 0) -> list[sqlite3.Row]:
+        """
+        Awards between two ISO dates (inclusive) of at least min_amount, largest first.
+        """
+        with self.connect() as conn:
+            return conn.execute(
+                """
+                SELECT contract_date, contractor_name, amount, purpose, agency_name
+                FROM awards WHERE contract_date BETWEEN ? AND ? AND amount >= ?
+                ORDER BY amount DESC
+                """,
+                (start_date, end_date, min_amount),
+            ).fetchall()
+
+    def get_awards_by_contractor(self, name: str) -> list[sqlite3.Row]:
+        """
+        Awards whose first contractor matches name (case-insensitive), newest first.
+        """
+        with self.connect() as conn:
+            return conn.execute(
+                """
+                SELECT contract_date, contractor_name, amount
+                FROM awards WHERE contractor_name = ? COLLATE NOCASE ORDER BY contract_date DESC
+                """,
+                (name,),
+            ).fetchall()
+
+    def iter_awards(self, after_id: int = 0) -> Iterator[list[sqlite3.Row]]:
+        """
+        Stream awards with id > after_id in id order, batch_size rows at a time.
+        """
+        with self.connect() as conn:
+            cursor = conn.execute(
+                """
+                SELECT id, award_text, contractors, purpose, amount, agency_name, agency_location
+                FROM awards WHERE id > ? ORDER BY id
+                """,
+                (after_id,),
+            )
+            while rows := cursor.fetchmany(self.batch_size):
+                yield rows
+
+    def iter_summarized_speeches(self, after_seq: int = 0) -> Iterator[list[sqlite3.Row]]:
+        """
+        Stream speeches summarized after summary_seq after_seq, in summary order, batch_size rows at a time.
+        """
+        with self.connect() as conn:
+            cursor = conn.execute(
+                """
+                SELECT summary_seq, content, summary FROM speeches
+                WHERE summary_seq > ? ORDER BY summary_seq
+                """,
+                (after_seq,),
+            )
+            while rows := cursor.fetchmany(self.batch_size):
+                yield rows
+
+    def import_json(
+        self,
+        debt_path: Optional[Path] = Path("../debt_data_json/debt_data.json"),
+        speeches_dir: Optional[Path] = Path("../fed_speeches_json"),
+        awards_path: Optional[Path] = Path("../dod_awards_json/dod_awards_master.json"),
+    ):
+        """
+        One-off migration of the legacy JSON files into the database. Safe to re-run.
+        """
+        if debt_path is not None and Path(debt_path).exists():
+            with open(debt_path, "r") as f:
+                count = self.upsert_debt_entries(json.load(f))
+            print(f"✔️ Imported {count} debt entries from {debt_path}")
+
+        if speeches_dir is not None and Path(speeches_dir).is_dir():
+            for json_path in sorted(Path(speeches_dir).glob("*.json")):
+                with open(json_path, "r") as f:
+                    data = json.load(f)
+                count = self.upsert_speeches(
+                    {**speech, "speaker": data["speaker"]} for speech in data.get("speeches", [])
+                )
+                print(f"✔️ Imported {count} speech(es) from {json_path}")
+
+        if awards_path is not None and Path(awards_path).exists():
+            with open(awards_path, "r", encoding="utf-8") as f:
+                count = self.upsert_awards(json.load(f))
+            print(f"✔️ Imported {count} award(s) from {awards_path}")
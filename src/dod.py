@@ -1,15 +1,18 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 from playwright.sync_api import sync_playwright
 from bs4 import BeautifulSoup
 import json
 import re
+import hashlib
 from pathlib import Path
 from feeds import Feed, BaseRSS
 from dataclasses import dataclass, field
 import feedparser
 from datetime import datetime
 from pydantic import BaseModel
-from clients import XAIClient
+from cleaning import clean_paragraphs, clean_text, is_noise_paragraph
+from db import Store
+from clients import XAIRequestError, CircuitOpenError, get_xai_client
 
 
 def sanitize_filename(name: str) -> str:
@@ -18,17 +21,14 @@ def sanitize_filename(name: str) -> str:
     # remove anything that's not alphanumeric, underscore, hyphen, or dot
     return re.sub(r"[^\w\-.]", "", name)
 
-def is_noise_paragraph(text: str) -> bool:
-    # match "*Small business" with optional space after *, case-insensitive
-    if re.match(r"^\*\s*small business$", text.strip(), flags=re.IGNORECASE):
-        return True
-    return False
-
 def load_processed_list(manifest_path: Path) -> set[str]:
     if manifest_path.exists():
         return {line.strip() for line in manifest_path.read_text(encoding="utf-8").splitlines() if line.strip()}
     return set()
 
+def text_digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
 def append_processed_file(manifest_path: Path, filename: str):
     with open(manifest_path, "a", encoding="utf-8") as f:
         f.write(filename + "\n")
@@ -147,9 +147,9 @@ class DOD_RSS(BaseRSS):
         if out_path.exists():
             print(f"File {out_path} already exists, skipping extraction.")
         else:
-            paragraphs_raw = [
-                p.get_text(strip=True) for p in body_div.find_all("p") if p.get_text(strip=True) and not (p.get("style") and "text-align" in p.get("style", ""))
-            ]
+            paragraphs_raw = clean_paragraphs(
+                p.get_text(strip=True) for p in body_div.find_all("p") if not (p.get("style") and "text-align" in p.get("style", ""))
+            )
 
             paragraphs = [
                 {
@@ -177,9 +177,11 @@ class DOD_RSS(BaseRSS):
             else:
                 print(f"Skipping entry without link: {title}")
 
-    def contract_awards_to_master_json(self, out_path: str, filepath: str):
+    def contract_awards_to_master_json(self, out_path: str, filepath: str, store: Optional[Store] = None) -> int:
         """
         Load one day's extracted paragraph file, get structured award info, and merge into a master JSON file.
+        New awards are also upserted into the database when a store is given.
+        Returns the number of paragraphs that could not be extracted.
         """
         out_path = Path(out_path)
         filepath = Path(filepath)
@@ -200,6 +202,9 @@ class DOD_RSS(BaseRSS):
 
         # Build a set of dedupe keys already present
         existing_keys = set()
+        # Digests of paragraphs already sent to Grok: those in the master file plus ones dropped as duplicates
+        extracted_path = out_path.parent / "extracted_paragraphs.txt"
+        extracted = load_processed_list(manifest_path=extracted_path)
         for a in master_awards:
             # key: contractor name(s) + contract_id(s) + contract_date
             contractors = a.get("contractors", [])
@@ -212,21 +217,37 @@ class DOD_RSS(BaseRSS):
             else:
                 key = (a.get("award_text", "").strip().lower(), a.get("contract_date", ""))
             existing_keys.add(key)
+            extracted.add(text_digest(a.get("award_text", "")))
 
+        xclient = get_xai_client()
         new_awards = []
+        failed = 0
         for entry in data:
-            text = entry.get("text", "").strip()
-            if not text or text.lower().startswith("*small business"):
+            text = clean_text(entry.get("text", ""))
+            if not text or is_noise_paragraph(text):
                 continue  # skip noise
+            digest = text_digest(text)
+            if digest in extracted:
+                continue  # extracted on a previous run, don't pay for it again
 
             # Get structured award
-            xclient = XAIClient()
-            award_details = xclient.get_structured_response(
-                model="grok-3-mini",
-                response_format=DodContractInfo,
-                content=text,
-            )
-            record = award_details.model_dump() if hasattr(award_details, "model_dump") else award_details.dict()
+            try:
+                award_details = xclient.get_structured_response(
+                    model="grok-3-mini",
+                    response_format=DodContractInfo,
+                    content=text,
+                )
+            except CircuitOpenError as e:
+                # API looks down: stop this file, keep what we have, and retry the rest on the next run
+                print(f"Stopping {filepath.name}: {e}")
+                failed += 1
+                break
+            except XAIRequestError as e:
+                print(f"Skipping paragraph in {filepath.name}: {e}")
+                failed += 1
+                continue
+            record = award_details.model_dump()
+            extracted.add(digest)
 
             # Attach metadata
             contract_date = entry.get("contract_date")
@@ -245,7 +266,8 @@ class DOD_RSS(BaseRSS):
                 key = (text.lower(), record["contract_date"])
 
             if key in existing_keys:
-                # already have it
+                # already have it; remember the paragraph so a retry doesn't extract it again
+                append_processed_file(extracted_path, digest)
                 continue
             existing_keys.add(key)
             new_awards.append(record)
@@ -258,8 +280,12 @@ class DOD_RSS(BaseRSS):
             with open(out_path, "w", encoding="utf-8") as f:
                 json.dump(master_awards, f, ensure_ascii=False, indent=2)
             print(f"Appended {len(new_awards)} new award(s) from {filepath.name} to {out_path}")
+            if store is not None:
+                store.upsert_awards(new_awards)
+
+        return failed
 
-    def batch_process_awards_json(self, data_dir: Path, master_path: Path):
+    def batch_process_awards_json(self, data_dir: Path, master_path: Path, store: Optional[Store] = None):
         manifest_path = data_dir / "processed_files.txt"
         processed = load_processed_list(manifest_path=manifest_path)
 
@@ -276,8 +302,12 @@ class DOD_RSS(BaseRSS):
 
             try:
                 print(f"Processing {file.name}...")
-                self.contract_awards_to_master_json(out_path=str(master_path), filepath=str(file))
-                append_processed_file(manifest_path, file.name)
+                failed = self.contract_awards_to_master_json(out_path=str(master_path), filepath=str(file), store=store)
+                if failed:
+                    # leave it out of the manifest so the failed paragraphs are retried next run
+                    print(f"{failed} paragraph(s) in {file.name} failed; will retry on next run")
+                else:
+                    append_processed_file(manifest_path, file.name)
             except Exception as e:
                 print(f"Failed to process {file.name}: {e}")
 
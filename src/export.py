@@ -0,0 +1,267 @@
+import gzip
+import hashlib
+import json
+import sqlite3
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator, Optional
+from clients import EXTRACTION_PROMPT
+from db import Store
+from summarize import SPEECH_PROMPT, estimate_tokens
+
+
+STATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen (hash TEXT PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS cursors (source TEXT PRIMARY KEY, last_id INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS open_shards (
+    source TEXT,
+    split TEXT,
+    shard_index INTEGER NOT NULL,
+    rows INTEGER NOT NULL,
+    raw_bytes INTEGER NOT NULL,         -- uncompressed JSONL bytes, for the rollover limit
+    file_size INTEGER NOT NULL,         -- committed on-disk size; anything past it is discarded on resume
+    PRIMARY KEY (source, split)
+);
+"""
+
+
+def _example(system: str, user: str, assistant: str) -> dict:
+    return {
+        "messages": [
+            {"role": "system", "content": system},
+            {"role": "user", "content": user},
+            {"role": "assistant", "content": assistant},
+        ]
+    }
+
+
+def award_example(row: sqlite3.Row) -> dict:
+    """
+    award_text -> DodContractInfo JSON, in chat fine-tuning format.
+    """
+    target = {
+        "contractors": json.loads(row["contractors"] or "[]"),
+        "purpose": row["purpose"],
+        "amount": row["amount"],
+        "contracting_agency": {"name": row["agency_name"], "location": row["agency_location"]},
+    }
+    return _example(EXTRACTION_PROMPT, row["award_text"], json.dumps(target, ensure_ascii=False))
+
+
+def speech_example(row: sqlite3.Row) -> dict:
+    """
+    Whole speech content -> SpeechSummary JSON, in chat fine-tuning format.
+    """
+    return _example(SPEECH_PROMPT, row["content"], row["summary"])
+
+
+@dataclass
+class ShardWriter:
+    """
+    Appends JSONL to the currently open shard of one (source, split), rolling over to the next
+    shard at max_rows rows or max_bytes uncompressed bytes.
+
+    Each batch is written as its own gzip member (multi-member gzip reads back as one stream),
+    so the file is valid at every commit and a resume can truncate to the committed size.
+    """
+    directory: Path
+    split: str
+    compress: bool
+    max_rows: int
+    max_bytes: int
+    shard_index: int = 0
+    rows: int = 0
+    raw_bytes: int = 0
+    file_size: int = 0
+    _raw: Optional[BinaryIO] = field(default=None, init=False, repr=False)
+    _out: Optional[BinaryIO] = field(default=None, init=False, repr=False)
+
+    @property
+    def path(self) -> Path:
+        suffix = ".jsonl.gz" if self.compress else ".jsonl"
+        return self.directory / f"{self.split}-{self.shard_index:05d}{suffix}"
+
+    def _open(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._raw = open(self.path, "r+b" if self.path.exists() else "wb")
+        # Drop anything written after the last commit (e.g. by an interrupted run).
+        self._raw.truncate(self.file_size)
+        self._raw.seek(self.file_size)
+        self._out = gzip.GzipFile(fileobj=self._raw, mode="wb") if self.compress else self._raw
+
+    def write(self, example: dict):
+        if self.rows >= self.max_rows or self.raw_bytes >= self.max_bytes:
+            self.close()
+            self.shard_index += 1
+            self.rows = self.raw_bytes = self.file_size = 0
+        if self._out is None:
+            self._open()
+        line = (json.dumps(example, ensure_ascii=False) + "\n").encode("utf-8")
+        self._out.write(line)
+        self.rows += 1
+        self.raw_bytes += len(line)
+
+    def close(self):
+        """
+        Finish the current member and record the file size to commit.
+        """
+        if self._out is None:
+            return
+        if self._out is not self._raw:
+            self._out.close()
+        self.file_size = self._raw.tell()
+        self._raw.close()
+        self._raw = self._out = None
+
+
+@dataclass
+class DatasetExporter:
+    """
+    Export fine-tuning pairs from the Store to sharded JSONL.
+
+    Rows are streamed in batches and appended to one open train and one open val shard per
+    source. After each batch the cursor, dedupe hashes and open-shard positions are committed
+    to a small SQLite state file next to the output. Memory stays bounded by the batch size,
+    re-runs continue from the last exported record, and an interrupted run's uncommitted
+    output is truncated away on resume.
+    """
+    store: Store
+    out_dir: str = "../datasets"
+    compress: bool = True
+    val_fraction: float = 0.1
+    min_tokens: int = 16
+    max_tokens: int = 8192
+    shard_max_rows: int = 100_000
+    shard_max_bytes: int = 256 * 1024 * 1024
+
+    def __post_init__(self):
+        self.out_path = Path(self.out_dir)
+        self.out_path.mkdir(parents=True, exist_ok=True)
+        self.state = sqlite3.connect(self.out_path / "export_state.db")
+        self.state.executescript(STATE_SCHEMA)
+
+    def close(self):
+        self.state.close()
+
+    def _cursor(self, source: str) -> int:
+        row = self.state.execute("SELECT last_id FROM cursors WHERE source = ?", (source,)).fetchone()
+        return row[0] if row else 0
+
+    def _writer(self, source: str, split: str) -> ShardWriter:
+        row = self.state.execute(
+            "SELECT shard_index, rows, raw_bytes, file_size FROM open_shards WHERE source = ? AND split = ?",
+            (source, split),
+        ).fetchone()
+        writer = ShardWriter(
+            directory=self.out_path / source,
+            split=split,
+            compress=self.compress,
+            max_rows=self.shard_max_rows,
+            max_bytes=self.shard_max_bytes,
+        )
+        if row:
+            writer.shard_index, writer.rows, writer.raw_bytes, writer.file_size = row
+        return writer
+
+    def _split(self, digest: str) -> str:
+        # Deterministic: the same example always lands in the same split.
+        return "val" if int(digest[:8], 16) / 0xFFFFFFFF < self.val_fraction else "train"
+
+    def _keep(self, example: dict) -> bool:
+        tokens = sum(estimate_tokens(m["content"] or "") for m in example["messages"])
+        return self.min_tokens <= tokens <= self.max_tokens
+
+    def _export_batch(
+        self, writers: dict[str, ShardWriter], examples: list[dict], dedupe_on_target: bool
+    ) -> set[str]:
+        new_hashes = set()
+        try:
+            for example in examples:
+                if not self._keep(example):
+                    continue
+                user = example["messages"][1]["content"]
+                # Split on the input alone so every version of an example stays on the same side.
+                split_digest = hashlib.sha256(user.encode("utf-8")).hexdigest()
+                if dedupe_on_target:
+                    target = example["messages"][2]["content"]
+                    digest = hashlib.sha256(f"{user}\0{target}".encode("utf-8")).hexdigest()
+                else:
+                    digest = split_digest
+                if digest in new_hashes:
+                    continue
+                if self.state.execute("SELECT 1 FROM seen WHERE hash = ?", (digest,)).fetchone():
+                    continue
+                new_hashes.add(digest)
+                writers[self._split(split_digest)].write(example)
+        finally:
+            for writer in writers.values():
+                writer.close()
+        return new_hashes
+
+    def _commit(self, source: str, writers: dict[str, ShardWriter], new_hashes: set[str], last_id: int):
+        self.state.executemany("INSERT OR IGNORE INTO seen (hash) VALUES (?)", ((h,) for h in new_hashes))
+        self.state.executemany(
+            """
+            INSERT OR REPLACE INTO open_shards (source, split, shard_index, rows, raw_bytes, file_size)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (source, split, w.shard_index, w.rows, w.raw_bytes, w.file_size)
+                for split, w in writers.items()
+            ],
+        )
+        self.state.execute(
+            """
+            INSERT INTO cursors (source, last_id) VALUES (?, ?)
+            ON CONFLICT (source) DO UPDATE SET last_id = excluded.last_id
+            """,
+            (source, last_id),
+        )
+        self.state.commit()
+
+    def _export(
+        self,
+        source: str,
+        batches: Iterator[list[sqlite3.Row]],
+        to_example: Callable[[sqlite3.Row], dict],
+        cursor_column: str,
+        dedupe_on_target: bool = False,
+    ) -> int:
+        writers = {split: self._writer(source, split) for split in ("train", "val")}
+        total = 0
+        for rows in batches:
+            new_hashes = self._export_batch(
+                writers, [to_example(row) for row in rows], dedupe_on_target
+            )
+            self._commit(source, writers, new_hashes, rows[-1][cursor_column])
+            total += len(new_hashes)
+        return total
+
+    def export_awards(self) -> int:
+        """
+        Export awards added since the last run, resuming from the last exported award id.
+        """
+        count = self._export(
+            "awards", self.store.iter_awards(after_id=self._cursor("awards")), award_example, "id"
+        )
+        print(f"✔️ Exported {count} award example(s) to {self.out_path / 'awards'}")
+        return count
+
+    def export_speeches(self) -> int:
+        """
+        Export speeches summarized since the last run, resuming from the last exported summary_seq.
+        Dedupe covers content and summary, so a re-summarized speech (e.g. after a SUMMARY_VERSION
+        bump) is exported again; its earlier example stays in the shards it was written to.
+        """
+        count = self._export(
+            "speeches",
+            self.store.iter_summarized_speeches(after_seq=self._cursor("speeches")),
+            speech_example,
+            "summary_seq",
+            dedupe_on_target=True,
+        )
+        print(f"✔️ Exported {count} speech example(s) to {self.out_path / 'speeches'}")
+        return count
+
+    def export(self) -> dict[str, int]:
+        return {"awards": self.export_awards(), "speeches": self.export_speeches()}
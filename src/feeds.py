@@ -7,6 +7,10 @@ from datetime import datetime
 import os
 from pathlib import Path
 import json
+from cleaning import clean_text, fix_mojibake
+from db import Store
+from clients import XAIRequestError, get_xai_client
+from summarize import content_hash, summarize_text
 
 
 @dataclass
@@ -117,14 +121,15 @@ class FederalReserve_RSS(BaseRSS):
         Fetch an individual speech from the FRB All Speeches and Testimony feed.
         """
         response = requests.get(url)
-        soup = BeautifulSoup(response.text, 'html.parser')
+        # Pass raw bytes so the page's declared charset is used instead of requests' latin-1 fallback
+        soup = BeautifulSoup(response.content, 'html.parser')
 
         # Extract title
-        title = soup.find('h3').get_text(strip=True)
+        title = clean_text(soup.find('h3').get_text(strip=True))
 
         # Extract speaker
         speaker_tag = soup.find('p', class_='speaker')
-        speaker = speaker_tag.get_text(strip=True) if speaker_tag else None
+        speaker = clean_text(speaker_tag.get_text(strip=True)) if speaker_tag else None
 
         # Extract date (convert to ISO format)
         date_tag = soup.find('p', class_='article__time')
@@ -133,7 +138,7 @@ class FederalReserve_RSS(BaseRSS):
 
         # Extract location (found in <em> inside the first paragraph)
         location_tag = soup.find('p', class_='location')
-        location = location_tag.get_text(strip=True) if location_tag else None
+        location = clean_text(location_tag.get_text(strip=True)) if location_tag else None
         content_div = soup.find('div', class_='col-xs-12 col-sm-8 col-md-8')
         if content_div:
             first_para = content_div.find('p')
@@ -141,7 +146,7 @@ class FederalReserve_RSS(BaseRSS):
 
         # Extract full content for summarization
         paragraphs = content_div.find_all('p') if content_div else []
-        content = "\n".join(p.get_text(strip=True) for p in paragraphs)
+        content = clean_text("\n".join(p.get_text(strip=True) for p in paragraphs))
 
         return {
             "title": title,
@@ -193,3 +198,76 @@ class FederalReserve_RSS(BaseRSS):
             json.dump(data, f, indent=2, ensure_ascii=False)
 
         print(f"✔️ Appended new speech to {json_path}")
+
+    def append_speech_to_db(self, speech: dict, store: Store):
+        """
+        Upsert a speech dict into the database, keyed by URL.
+        """
+        store.upsert_speeches([speech])
+        print(f"✔️ Upserted speech {speech.get('url')} to {store.path}")
+
+    def clean_speeches_json(self, base_dir="../fed_speeches_json"):
+        """
+        Run the ingest cleaning stage over speeches stored before it existed.
+        Those records were decoded as latin-1, so their text fields also get the mojibake repair.
+        """
+        for json_path in sorted(Path(base_dir).glob("*.json")):
+            with open(json_path, "r") as f:
+                data = json.load(f)
+
+            data["speaker"] = clean_text(fix_mojibake(data["speaker"]))
+            for speech in data.get("speeches", []):
+                for key in ("title", "location", "content"):
+                    if speech.get(key):
+                        speech[key] = clean_text(fix_mojibake(speech[key]))
+
+            with open(json_path, "w") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+
+            print(f"✔️ Cleaned {len(data.get('speeches', []))} speech(es) in {json_path}")
+
+    def summarize_speeches_json(
+        self, base_dir="../fed_speeches_json", model: str = "grok-3-mini", store: Optional[Store] = None
+    ):
+        """
+        Add a Grok summary to every stored speech.
+        Summaries are cached on the record by content hash, so unchanged speeches are skipped.
+        Newly summarized speeches are also upserted into the database when a store is given.
+        """
+        xclient = get_xai_client()
+
+        for json_path in sorted(Path(base_dir).glob("*.json")):
+            with open(json_path, "r") as f:
+                data = json.load(f)
+
+            updated = []
+            for speech in data.get("speeches", []):
+                content = speech.get("content", "")
+                if not content:
+                    continue
+
+                key = content_hash(content, model)
+                if speech.get("summary_hash") == key:
+                    continue
+
+                try:
+                    summary = summarize_text(xclient, content, model=model)
+                except XAIRequestError as e:
+                    print(f"⚠️ Could not summarize {speech.get('url')}: {e}")
+                    continue
+
+                speech["summary"] = summary.model_dump()
+                speech["summary_hash"] = key
+                updated.append(speech)
+
+            if not updated:
+                print(f"⚠️ No speeches to summarize in {json_path}. Skipping.")
+                continue
+
+            with open(json_path, "w") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+
+            print(f"✔️ Summarized {len(updated)} speech(es) in {json_path}")
+
+            if store is not None:
+                store.upsert_speeches({**speech, "speaker": data["speaker"]} for speech in updated)
@@ -0,0 +1,155 @@
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from pydantic import BaseModel
+from clients import XAIClient
+
+
+# Bump when the prompts or SpeechSummary change so cached summaries are regenerated.
+SUMMARY_VERSION = "2"
+
+# Rough chars-per-token ratio for English prose; good enough to stay well inside the context window.
+CHARS_PER_TOKEN = 4
+
+SPEECH_PROMPT = (
+    "Summarize this Federal Reserve speech or testimony. "
+    "Capture the speaker's views on the economy, monetary policy and regulation, "
+    "and any concrete figures or policy signals."
+)
+MAP_PROMPT = (
+    "Summarize this section of a Federal Reserve speech or testimony. "
+    "Capture the speaker's views on the economy, monetary policy and regulation, "
+    "and any concrete figures or policy signals."
+)
+REDUCE_PROMPT = (
+    "These are summaries of consecutive sections of one Federal Reserve speech or testimony. "
+    "Combine them into a single summary of the whole speech, without repeating points."
+)
+
+
+class SpeechSummary(BaseModel):
+    """
+    Pydantic model for a structured summary of a Federal Reserve speech or testimony.
+    """
+    summary: str
+    key_points: list[str]
+    policy_stance: str
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def content_hash(content: str, model: str) -> str:
+    """
+    Cache key for a summary: changes when the content, model or SUMMARY_VERSION changes.
+    """
+    digest = hashlib.sha256()
+    for part in (SUMMARY_VERSION, model, content):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _split_long_line(line: str, max_tokens: int) -> list[str]:
+    pieces = []
+    current = []
+    for word in line.split():
+        candidate = " ".join(current + [word])
+        if current and estimate_tokens(candidate) > max_tokens:
+            pieces.append(" ".join(current))
+            current = [word]
+        else:
+            current.append(word)
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+
+def chunk_text(text: str, max_tokens: int) -> list[str]:
+    """
+    Split text on line boundaries into chunks of at most max_tokens (estimated).
+    A single line longer than the budget is split on whitespace; only a single word
+    longer than the budget can exceed it.
+    """
+    chunks = []
+    current = []
+
+    for line in text.splitlines():
+        pieces = [line] if estimate_tokens(line) <= max_tokens else _split_long_line(line, max_tokens)
+
+        for piece in pieces:
+            if current and estimate_tokens("\n".join(current + [piece])) > max_tokens:
+                chunks.append("\n".join(current))
+                current = []
+            current.append(piece)
+
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def _format_partial(index: int, partial: SpeechSummary) -> str:
+    points = "\n".join(f"- {point}" for point in partial.key_points)
+    return f"Section {index}:\n{partial.summary}\nPolicy stance: {partial.policy_stance}\n{points}"
+
+
+def _format_group(partials: list[SpeechSummary]) -> str:
+    return "\n\n".join(_format_partial(i, p) for i, p in enumerate(partials, start=1))
+
+
+def _group_partials(partials: list[SpeechSummary], max_tokens: int) -> list[str]:
+    """
+    Pack consecutive partials into reduce inputs of at most max_tokens (estimated).
+    Every group holds at least two partials so each reduce round shrinks the list and no
+    reduce call is spent on a lone summary; a group can therefore exceed the budget when
+    individual partials are over half of it.
+    """
+    groups = []
+    current = []
+    for partial in partials:
+        if len(current) >= 2 and estimate_tokens(_format_group(current + [partial])) > max_tokens:
+            groups.append(current)
+            current = []
+        current.append(partial)
+    if len(current) == 1 and groups:
+        groups[-1].append(current.pop())
+    if current:
+        groups.append(current)
+    return [_format_group(group) for group in groups]
+
+
+def summarize_text(
+    client: XAIClient,
+    content: str,
+    model: str = "grok-3-mini",
+    max_chunk_tokens: int = 6000,
+    max_workers: int = 4,
+) -> SpeechSummary:
+    """
+    Map-reduce summarization: summarize token-bounded chunks in parallel with MAP_PROMPT, then
+    combine the partial summaries with REDUCE_PROMPT in rounds until one summary is left.
+    Text that fits in one chunk is summarized directly with SPEECH_PROMPT.
+
+    :raises XAIRequestError: If any request fails.
+    """
+
+    def summarize(text: str, system_prompt: str) -> SpeechSummary:
+        return client.get_structured_response(
+            model=model,
+            response_format=SpeechSummary,
+            content=text,
+            system_prompt=system_prompt,
+        )
+
+    chunks = chunk_text(content, max_chunk_tokens)
+    if len(chunks) <= 1:
+        return summarize(content, SPEECH_PROMPT)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        partials = list(pool.map(lambda chunk: summarize(chunk, MAP_PROMPT), chunks))
+
+        while len(partials) > 1:
+            groups = _group_partials(partials, max_chunk_tokens)
+            partials = list(pool.map(lambda group: summarize(group, REDUCE_PROMPT), groups))
+
+    return partials[0]
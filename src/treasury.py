@@ -5,6 +5,7 @@ import json
 from pathlib import Path
 import feedparser
 from feeds import BaseRSS, Feed
+from db import Store
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
@@ -199,4 +200,11 @@ class TreasuryDirect_RSS(BaseRSS):
         with open(json_path, "w") as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
 
-        print(f"✔️ Synced debt data to {json_path}")
\ No newline at end of file
+        print(f"✔️ Synced debt data to {json_path}")
+
+    def sync_debt_data_to_db(self, entries: list[DebtEntry], store: Store):
+        """
+        Upsert the debt data into the database.
+        """
+        count = store.upsert_debt_entries(entries)
+        print(f"✔️ Synced {count} debt entries to {store.path}")